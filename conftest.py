@@ -0,0 +1,2 @@
+# test_conexion.py es un script manual contra MySQL, no una suite de pytest
+collect_ignore = ['test_conexion.py']
@@ -7,8 +7,12 @@ Base de Datos: MySQL
 
 import pandas as pd
 import mysql.connector
+from mysql.connector import errorcode
 from datetime import datetime
+import hashlib
+import json
 import os
+import time
 
 # ============================================================================
 # CONFIGURACIÓN
@@ -24,6 +28,35 @@ DB_CONFIG = {
 
 DATA_DIR = 'data'
 
+# Migraciones de esquema versionadas: (versión, descripción, archivo)
+# Se aplican una sola vez y en orden; una migración aplicada no se edita,
+# los cambios de esquema se agregan como una versión nueva.
+MIGRACIONES = [
+    (1, 'Esquema estrella inicial', 'sql/create_tables.sql'),
+    (2, 'Pit stops y resumen por temporada', 'sql/migraciones/002_fact_pit_stop.sql'),
+]
+
+TABLA_MIGRACIONES = 'meta_migraciones'
+
+# Directorio de la exportación columnar (Parquet particionado por temporada)
+EXPORT_DIR = os.path.join('export', 'parquet')
+
+# Tablas con grano por carrera que se particionan por temporada al exportar.
+# Las dimensiones y los snapshots (una fila por año) van en un único archivo.
+TABLAS_PARTICIONADAS = {
+    'fact_resultado_carrera',
+    'fact_campeonato_piloto',
+    'fact_campeonato_constructor',
+    'fact_clasificacion',
+    'fact_pit_stop',
+}
+
+# Filas por sentencia INSERT multi-fila en la carga masiva
+BATCH_SIZE = 1000
+
+# Tiempos 'ss.sss', 'm:ss.sss' o 'h:mm:ss.sss' (horas y minutos opcionales)
+PATRON_TIEMPO = r'^(?:(?:(?P<horas>\d+):)?(?P<minutos>\d+):)?(?P<segundos>\d+(?:\.\d+)?)$'
+
 # ============================================================================
 # FUNCIONES AUXILIARES
 # ============================================================================
@@ -37,371 +70,625 @@ def read_csv_safe(filename):
     filepath = os.path.join(DATA_DIR, filename)
     return pd.read_csv(filepath, na_values=['\\N', 'N/A', ''])
 
-def execute_sql_file(conn, filepath):
-    """Ejecutar archivo SQL (MySQL requiere ejecutar múltiples statements)"""
+def calcular_tiempo_id(fechas):
+    """Convertir una serie de fechas a tiempo_id (YYYYMMDD) de forma vectorizada"""
+    fechas = pd.to_datetime(fechas)
+    return (fechas.dt.year * 10000 + fechas.dt.month * 100 + fechas.dt.day).astype('Int64')
+
+def parsear_tiempo_ms(serie):
+    """
+    Convertir una serie de tiempos en texto a milisegundos (vectorizado).
+    Acepta 'ss.sss', 'm:ss.sss' y 'h:mm:ss.sss'; '\\N', vacíos y valores
+    con otro formato quedan como nulos. Devuelve una serie Int64.
+    """
+    texto = serie.astype('string').str.strip().replace('\\N', pd.NA)
+    partes = texto.str.extract(PATRON_TIEMPO)
+    
+    horas = pd.to_numeric(partes['horas']).fillna(0)
+    minutos = pd.to_numeric(partes['minutos']).fillna(0)
+    segundos = pd.to_numeric(partes['segundos'])
+    
+    ms = ((horas * 60 + minutos) * 60 + segundos) * 1000
+    return ms.round().astype('Int64')
+
+def hash_particion(df, esquema=None):
+    """
+    Huella de una partición (detecta cambios entre ejecuciones): contenido,
+    nombres y dtypes de columna, y el `esquema` Arrow si se indica (los dtype
+    object de pandas no distinguen, p. ej., texto de fechas).
+    """
+    huella = hashlib.sha256(repr(list(df.dtypes.astype(str).items())).encode('utf-8'))
+    if esquema is not None:
+        huella.update(str(esquema).encode('utf-8'))
+    huella.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return huella.hexdigest()
+
+def df_a_filas(df):
+    """Convertir DataFrame a tuplas con tipos nativos de Python (NaN → None)"""
+    df_obj = df.astype(object)
+    df_obj = df_obj.where(pd.notna(df_obj), None)
+    return list(df_obj.itertuples(index=False, name=None))
+
+def cargar_bulk(conn, tabla, df, verbo='INSERT IGNORE', actualizar=None, batch_size=BATCH_SIZE):
+    """
+    Carga masiva de un DataFrame en una tabla.
+    Envía un INSERT multi-fila por lote (un round trip cada batch_size filas)
+    y hace commit por lote. Las columnas del DataFrame deben coincidir con
+    las de la tabla destino. Si se indican columnas en `actualizar`, las
+    filas existentes se actualizan (ON DUPLICATE KEY UPDATE) en lugar de ignorarse.
+    Usa alias de fila (MySQL 8.0.19+) en lugar de VALUES(), obsoleto desde 8.0.20.
+    """
+    columnas = ', '.join(df.columns)
+    placeholder = '(' + ', '.join(['%s'] * len(df.columns)) + ')'
+    sufijo = ''
+    if actualizar:
+        verbo = 'INSERT'
+        sufijo = ' AS nuevo ON DUPLICATE KEY UPDATE ' + ', '.join(f"{col} = nuevo.{col}" for col in actualizar)
+    filas = df_a_filas(df)
     cursor = conn.cursor()
-    # Leer el archivo intentando diferentes codificaciones para evitar
-    # errores de decodificación en Windows (cp1252) cuando el archivo
-    # contiene caracteres unicode o fue guardado en UTF-8.
-    encodings_to_try = ['utf-8-sig', 'utf-8', 'latin-1']
+
+    try:
+        for inicio in range(0, len(filas), batch_size):
+            lote = filas[inicio:inicio + batch_size]
+            valores = ', '.join([placeholder] * len(lote))
+            params = [val for fila in lote for val in fila]
+            cursor.execute(
+                f"{verbo} INTO {tabla} ({columnas}) VALUES {valores}{sufijo}", params
+            )
+            conn.commit()
+    finally:
+        cursor.close()
+
+    return len(filas)
+
+def dividir_sentencias(sql_script):
+    """
+    Dividir un script SQL en sentencias individuales.
+    Recorre el texto carácter a carácter: un ';' solo separa sentencias
+    fuera de literales ('...', "...", `...`) y de comentarios (--, #, /* */).
+    Los comentarios de línea y de bloque se descartan; los comentarios
+    ejecutables de MySQL (/*! ... */) se conservan.
+    """
+    sentencias = []
+    actual = []
+    i = 0
+    n = len(sql_script)
+    
+    while i < n:
+        c = sql_script[i]
+        siguiente = sql_script[i + 1] if i + 1 < n else ''
+        
+        # Literales: copiar hasta la comilla de cierre (respetando \ y comillas dobladas)
+        if c in ("'", '"', '`'):
+            inicio = i
+            i += 1
+            while i < n:
+                if sql_script[i] == '\\' and c != '`':
+                    i += 2
+                    continue
+                if sql_script[i] == c:
+                    if i + 1 < n and sql_script[i + 1] == c:
+                        i += 2
+                        continue
+                    break
+                i += 1
+            actual.append(sql_script[inicio:i + 1])
+            i += 1
+        
+        # Comentarios de línea: '-- ' (MySQL exige espacio) y '#'
+        elif (c == '-' and siguiente == '-' and sql_script[i + 2:i + 3] in ('', ' ', '\t', '\n', '\r')) or c == '#':
+            fin = sql_script.find('\n', i)
+            i = n if fin == -1 else fin
+        
+        # Comentarios de bloque
+        elif c == '/' and siguiente == '*':
+            fin = sql_script.find('*/', i + 2)
+            fin = n if fin == -1 else fin + 2
+            if sql_script[i + 2:i + 3] == '!':
+                actual.append(sql_script[i:fin])
+            else:
+                actual.append(' ')
+            i = fin
+        
+        elif c == ';':
+            sentencia = ''.join(actual).strip()
+            if sentencia:
+                sentencias.append(sentencia)
+            actual = []
+            i += 1
+        
+        else:
+            actual.append(c)
+            i += 1
+    
+    sentencia = ''.join(actual).strip()
+    if sentencia:
+        sentencias.append(sentencia)
+    
+    return sentencias
+
+def leer_migracion(filepath):
+    """
+    Leer un archivo de migración y calcular su checksum.
+    El checksum (SHA-256) se calcula sobre el texto decodificado, sin BOM y
+    con saltos de línea normalizados a '\\n', para que un checkout con CRLF
+    (git autocrlf en Windows) o un re-guardado con BOM no lo cambien.
+    """
+    with open(filepath, 'rb') as f:
+        contenido = f.read()
+    
+    # Intentar diferentes codificaciones para evitar errores de decodificación
+    # en Windows (cp1252) cuando el archivo fue guardado en UTF-8 o latin-1.
     sql_script = None
-    for enc in encodings_to_try:
+    for enc in ['utf-8-sig', 'utf-8', 'latin-1']:
         try:
-            with open(filepath, 'r', encoding=enc) as f:
-                sql_script = f.read()
+            sql_script = contenido.decode(enc)
             break
         except UnicodeDecodeError:
             # Intentar la siguiente codificación
             continue
-
+    
     if sql_script is None:
-        # Como último recurso, leer en modo binario y decodificar reemplazando
-        # caracteres no decodificables para evitar fallos duros.
-        with open(filepath, 'rb') as f:
-            sql_script = f.read().decode('utf-8', errors='replace')
+        # Como último recurso, decodificar reemplazando caracteres inválidos
+        sql_script = contenido.decode('utf-8', errors='replace')
+    
+    sql_script = sql_script.lstrip('\ufeff').replace('\r\n', '\n')
+    return sql_script, hashlib.sha256(sql_script.encode('utf-8')).hexdigest()
+
+def leer_versiones_aplicadas(cursor):
+    """Leer {versión: checksum} desde la tabla de metadatos (la crea si no existe)"""
+    try:
+        cursor.execute(f"SELECT version, checksum FROM {TABLA_MIGRACIONES}")
+        return dict(cursor.fetchall())
+    except mysql.connector.Error as e:
+        if e.errno != errorcode.ER_NO_SUCH_TABLE:
+            raise
+    
+    cursor.execute(f"""
+        CREATE TABLE {TABLA_MIGRACIONES} (
+            version      INT PRIMARY KEY,
+            descripcion  VARCHAR(200),
+            archivo      VARCHAR(255),
+            checksum     CHAR(64) NOT NULL,
+            aplicada_en  DATETIME NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Metadatos: Migraciones de esquema aplicadas'
+    """)
+    return {}
 
-    # Ejecutar cada statement individualmente (separados por ';')
-    for statement in sql_script.split(';'):
-        statement = statement.strip()
-        if statement:  # Ignorar statements vacíos
-            cursor.execute(statement)
+def aplicar_migraciones(conn):
+    """
+    Aplicar las migraciones de MIGRACIONES que aún no figuran en la tabla
+    de metadatos, en orden de versión. Si el esquema está al día no se
+    ejecuta ningún DDL. Devuelve la lista de versiones aplicadas.
+    """
+    cursor = conn.cursor()
+    
+    try:
+        aplicadas = leer_versiones_aplicadas(cursor)
+        nuevas = []
+        
+        for version, descripcion, filepath in sorted(MIGRACIONES):
+            sql_script, checksum = leer_migracion(filepath)
+            
+            if version in aplicadas:
+                # Una migración aplicada no debe editarse: crear una nueva versión
+                if aplicadas[version] != checksum:
+                    raise RuntimeError(
+                        f"La migración {version} ({filepath}) cambió después de aplicarse "
+                        f"(checksum {aplicadas[version][:12]}… ≠ {checksum[:12]}…)"
+                    )
+                continue
+            
+            print(f"  🔧 Aplicando migración {version}: {descripcion}")
+            for sentencia in dividir_sentencias(sql_script):
+                cursor.execute(sentencia)
+            
+            cursor.execute(f"""
+                INSERT INTO {TABLA_MIGRACIONES} (version, descripcion, archivo, checksum, aplicada_en)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (version, descripcion, filepath, checksum, datetime.now()))
+            conn.commit()
+            nuevas.append(version)
+        
+        return nuevas
     
-    cursor.close()
+    finally:
+        cursor.close()
 
 # ============================================================================
-# PASO 1: CREAR ESQUEMA (Ejecutar DDL)
+# PASO 1: MIGRAR ESQUEMA (Ejecutar DDL versionado)
 # ============================================================================
 
 def crear_esquema():
-    """Crear todas las tablas del DW"""
+    """Aplicar las migraciones de esquema pendientes del DW"""
     print("=" * 80)
-    print("PASO 1: CREANDO ESQUEMA DE BASE DE DATOS")
+    print("PASO 1: VERIFICANDO ESQUEMA DE BASE DE DATOS")
     print("=" * 80)
     
     conn = get_connection()
     
     try:
-        execute_sql_file(conn, 'sql/create_tables.sql')
-        conn.commit()
-        print("✅ Esquema creado exitosamente\n")
+        nuevas = aplicar_migraciones(conn)
+        if nuevas:
+            print(f"✅ Esquema actualizado: {len(nuevas)} migración(es) aplicada(s)\n")
+        else:
+            print(f"✅ Esquema al día (versión {max(v for v, _, _ in MIGRACIONES)}), sin cambios\n")
     except Exception as e:
-        print(f"❌ Error al crear esquema: {e}")
+        print(f"❌ Error al migrar esquema: {e}")
         conn.rollback()
         raise
     finally:
         conn.close()
 
 # ============================================================================
-# PASO 2: CARGAR DIMENSIONES (Orden Hefesto)
+# PASO 2/3: MAPEOS DECLARATIVOS (Fuente CSV → Tabla del DW)
 # ============================================================================
+#
+# Cada mapeo describe una carga sin escribir código de bucle:
+#   titulo        Texto del encabezado en la salida
+#   fuente        Archivo CSV en DATA_DIR
+#   unir_carrera  Columnas de races.csv a agregar vía raceId (lookups); además
+#                 acepta 'rondas_temporada' (última ronda del calendario del año)
+#   preparar      (opcional) función DataFrame → DataFrame previa al mapeo
+#   columnas      {columna origen: columna destino}
+#   derivadas     {columna destino: función(df) → Serie}; se evalúan en orden y
+#                 df es el origen más las derivadas anteriores (no recalcular)
+#   clave         Columnas de la PRIMARY KEY de la tabla destino
+#   requeridas    Columnas destino que no pueden ser nulas
+#   no_cargar     Columnas que quedan en memoria (export) pero no van a MySQL
+#   actualizar    (opcional) Columnas a refrescar si la fila ya existe; por
+#                 defecto todas las cargadas que no son clave (upsert)
+#   verbo         (opcional) 'INSERT IGNORE' para no tocar filas existentes
+#
+# Las tablas persisten entre ejecuciones (migraciones): el upsert hace que
+# una corrección en el CSV llegue a MySQL. Las filas borradas de las fuentes
+# NO se eliminan del DW.
+#
+# El orden del diccionario es el orden de carga (Hefesto: dimensiones → hechos).
 
-def cargar_dim_piloto():
-    """
-    1️⃣ DIMENSIÓN: PILOTO
-    Fuente: drivers.csv
-    Transformación: Concatenar nombre completo
-    """
-    print("-" * 80)
-    print("1️⃣  Cargando DIM_PILOTO...")
-    print("-" * 80)
-    
-    # EXTRACT
-    df = read_csv_safe('drivers.csv')
-    print(f"📥 Extraídos: {len(df)} registros")
-    
-    # TRANSFORM
-    df['nombre_completo'] = df['forename'] + ' ' + df['surname']
-    
-    # Seleccionar y renombrar columnas
-    df_clean = df[[
-        'driverId', 'forename', 'surname', 'code', 
-        'number', 'nationality', 'dob', 'url'
-    ]].copy()
-    
-    df_clean['nombre_completo'] = df['nombre_completo']
-    
-    # Renombrar para coincidir con BD
-    df_clean.columns = [
-        'piloto_id', 'nombre', 'apellido', 'codigo',
-        'numero', 'nacionalidad', 'fecha_nacimiento', 'url', 'nombre_completo'
-    ]
-    
-    # CRÍTICO: Reordenar columnas para que coincidan EXACTAMENTE con el INSERT
-    columnas_sql = [
-        'piloto_id', 'nombre', 'apellido', 'nombre_completo', 'codigo',
-        'numero', 'nacionalidad', 'fecha_nacimiento', 'url'
-    ]
-    df_clean = df_clean[columnas_sql]
+MESES_ES = ['', 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+            'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+DIAS_ES = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+
+def fechas_unicas(df_races):
+    """Fechas únicas de carrera (base de la dimensión tiempo generada)"""
+    fechas = pd.to_datetime(df_races['date']).dropna().drop_duplicates()
+    return pd.DataFrame({'fecha_dt': fechas}).reset_index(drop=True)
+
+def es_final_temporada(df):
+    """Marca las filas de la última ronda del calendario de cada temporada (races.csv)"""
+    return df['round'] == df['rondas_temporada']
+
+MAPEOS = {
+    'dim_piloto': {
+        'titulo': '1️⃣  DIM_PILOTO',
+        'fuente': 'drivers.csv',
+        'columnas': {
+            'driverId': 'piloto_id', 'forename': 'nombre', 'surname': 'apellido',
+            'code': 'codigo', 'number': 'numero', 'nationality': 'nacionalidad', 'url': 'url',
+        },
+        'derivadas': {
+            'nombre_completo': lambda df: df['forename'] + ' ' + df['surname'],
+            'fecha_nacimiento': lambda df: pd.to_datetime(df['dob']).dt.date,
+        },
+        'clave': ['piloto_id'],
+        'requeridas': ['piloto_id'],
+    },
+    'dim_constructor': {
+        'titulo': '2️⃣  DIM_CONSTRUCTOR',
+        'fuente': 'constructors.csv',
+        'columnas': {
+            'constructorId': 'constructor_id', 'name': 'nombre', 'constructorRef': 'referencia',
+            'nationality': 'nacionalidad', 'url': 'url',
+        },
+        'clave': ['constructor_id'],
+        'requeridas': ['constructor_id'],
+    },
+    'dim_circuito': {
+        'titulo': '3️⃣  DIM_CIRCUITO',
+        'fuente': 'circuits.csv',
+        'columnas': {
+            'circuitId': 'circuito_id', 'name': 'nombre', 'location': 'ubicacion', 'country': 'pais',
+            'lat': 'latitud', 'lng': 'longitud', 'alt': 'altitud', 'url': 'url',
+        },
+        'clave': ['circuito_id'],
+        'requeridas': ['circuito_id'],
+    },
+    'dim_tiempo': {
+        'titulo': '4️⃣  DIM_TIEMPO (Generación Dimensional)',
+        'fuente': 'races.csv',
+        'preparar': fechas_unicas,
+        'columnas': {},
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['fecha_dt']),
+            'fecha': lambda df: df['fecha_dt'].dt.date,
+            'anio': lambda df: df['fecha_dt'].dt.year,
+            'mes': lambda df: df['fecha_dt'].dt.month,
+            'dia': lambda df: df['fecha_dt'].dt.day,
+            'trimestre': lambda df: df['fecha_dt'].dt.quarter,
+            'decada': lambda df: df['fecha_dt'].dt.year // 10 * 10,
+            'nombre_mes': lambda df: df['fecha_dt'].dt.month.map(lambda m: MESES_ES[m]),
+            'dia_semana': lambda df: df['fecha_dt'].dt.dayofweek.map(lambda d: DIAS_ES[d]),
+            'es_fin_semana': lambda df: df['fecha_dt'].dt.dayofweek >= 5,  # Sábado=5, Domingo=6
+        },
+        'clave': ['tiempo_id'],
+        'requeridas': ['tiempo_id'],
+    },
+    'dim_carrera': {
+        'titulo': '5️⃣  DIM_CARRERA',
+        'fuente': 'races.csv',
+        'columnas': {
+            'raceId': 'carrera_id', 'year': 'anio', 'round': 'ronda', 'circuitId': 'circuito_id',
+            'name': 'nombre_gp', 'url': 'url',
+        },
+        'derivadas': {
+            # Tipados (DATE/TIME) para MySQL y para el export Parquet, como dim_tiempo.fecha
+            'fecha': lambda df: pd.to_datetime(df['date']).dt.date,
+            'hora': lambda df: pd.to_datetime(df['time'], format='%H:%M:%S').dt.time,
+        },
+        'clave': ['carrera_id'],
+        'requeridas': ['carrera_id', 'circuito_id'],
+    },
+    'fact_resultado_carrera': {
+        'titulo': '6️⃣  FACT_RESULTADO_CARRERA',
+        'fuente': 'results.csv',
+        'unir_carrera': ['date', 'circuitId'],
+        'columnas': {
+            'raceId': 'carrera_id', 'driverId': 'piloto_id', 'constructorId': 'constructor_id',
+            'circuitId': 'circuito_id', 'points': 'puntos', 'position': 'posicion_final',
+            'grid': 'posicion_salida', 'laps': 'vueltas_completadas', 'milliseconds': 'tiempo_final_ms',
+            'fastestLap': 'mejor_vuelta', 'fastestLapSpeed': 'velocidad_promedio',
+        },
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['date']),
+            'tiempo_mejor_vuelta': lambda df: parsear_tiempo_ms(df['fastestLapTime']),
+            'es_victoria': lambda df: df['position'] == 1,
+            'es_podio': lambda df: df['position'] <= 3,
+            'es_pole': lambda df: df['grid'] == 1,
+            'es_punto': lambda df: df['points'] > 0,
+            'completo_carrera': lambda df: df['statusId'] == 1,  # 1 = "Finished"
+        },
+        'clave': ['carrera_id', 'piloto_id'],
+        'requeridas': ['carrera_id', 'piloto_id', 'constructor_id', 'circuito_id', 'tiempo_id'],
+    },
+    'fact_campeonato_piloto': {
+        'titulo': '7️⃣  FACT_CAMPEONATO_PILOTO',
+        'fuente': 'driver_standings.csv',
+        'unir_carrera': ['year', 'round', 'date', 'rondas_temporada'],
+        'columnas': {
+            'raceId': 'carrera_id', 'driverId': 'piloto_id', 'points': 'puntos',
+            'position': 'posicion', 'wins': 'victorias', 'year': 'anio',
+        },
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['date']),
+            'es_final_temporada': es_final_temporada,
+        },
+        'clave': ['carrera_id', 'piloto_id'],
+        'requeridas': ['carrera_id', 'piloto_id', 'tiempo_id'],
+        'no_cargar': ['anio'],
+    },
+    'fact_campeonato_constructor': {
+        'titulo': '8️⃣  FACT_CAMPEONATO_CONSTRUCTOR',
+        'fuente': 'constructor_standings.csv',
+        'unir_carrera': ['year', 'round', 'date', 'rondas_temporada'],
+        'columnas': {
+            'raceId': 'carrera_id', 'constructorId': 'constructor_id', 'points': 'puntos',
+            'position': 'posicion', 'wins': 'victorias', 'year': 'anio',
+        },
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['date']),
+            'es_final_temporada': es_final_temporada,
+        },
+        'clave': ['carrera_id', 'constructor_id'],
+        'requeridas': ['carrera_id', 'constructor_id', 'tiempo_id'],
+        'no_cargar': ['anio'],
+    },
+    'fact_clasificacion': {
+        'titulo': '🔟 FACT_CLASIFICACION',
+        'fuente': 'qualifying.csv',
+        'unir_carrera': ['date'],
+        'columnas': {
+            'raceId': 'carrera_id', 'driverId': 'piloto_id', 'constructorId': 'constructor_id',
+            'position': 'posicion',
+        },
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['date']),
+            'q1_ms': lambda df: parsear_tiempo_ms(df['q1']),
+            'q2_ms': lambda df: parsear_tiempo_ms(df['q2']),
+            'q3_ms': lambda df: parsear_tiempo_ms(df['q3']),
+            # Mejor vuelta de la clasificación (ignora sesiones no disputadas)
+            'mejor_tiempo_ms': lambda df: df[['q1_ms', 'q2_ms', 'q3_ms']].min(axis=1).astype('Int64'),
+        },
+        'clave': ['carrera_id', 'piloto_id'],
+        'requeridas': ['carrera_id', 'piloto_id', 'constructor_id', 'tiempo_id'],
+    },
+    'fact_pit_stop': {
+        'titulo': '1️⃣1️⃣ FACT_PIT_STOP',
+        'fuente': 'pit_stops.csv',
+        'unir_carrera': ['year', 'date'],
+        'columnas': {
+            'raceId': 'carrera_id', 'driverId': 'piloto_id', 'stop': 'parada',
+            'lap': 'vuelta', 'time': 'hora', 'year': 'anio',
+        },
+        'derivadas': {
+            'tiempo_id': lambda df: calcular_tiempo_id(df['date']),
+            # milliseconds; si falta, se parsea duration ('26.898', '16:44.718')
+            'duracion_ms': lambda df: df['milliseconds'].astype('Int64').fillna(
+                parsear_tiempo_ms(df['duration'])
+            ),
+        },
+        'clave': ['carrera_id', 'piloto_id', 'parada'],
+        'requeridas': ['carrera_id', 'piloto_id', 'parada', 'tiempo_id'],
+        'no_cargar': ['anio'],
+    },
+}
+
+def leer_fuente(filename, fuentes):
+    """Leer un CSV una sola vez por ejecución (cache compartida entre mapeos)"""
+    if filename not in fuentes:
+        fuentes[filename] = read_csv_safe(filename)
+    return fuentes[filename]
+
+def transformar_mapeo(mapeo, fuentes):
+    """Aplicar un mapeo: lookups, selección/renombrado, derivadas, nulos y tipos"""
+    df = leer_fuente(mapeo['fuente'], fuentes)
+    
+    if mapeo.get('unir_carrera'):
+        df_races = leer_fuente('races.csv', fuentes)
+        if 'rondas_temporada' in mapeo['unir_carrera']:
+            df_races = df_races.assign(
+                rondas_temporada=df_races.groupby('year')['round'].transform('max')
+            )
+        df = df.merge(df_races[['raceId'] + mapeo['unir_carrera']], on='raceId', how='left')
+    
+    if 'preparar' in mapeo:
+        df = mapeo['preparar'](df)
+    
+    columnas = mapeo['columnas']
+    df_out = df[list(columnas)].rename(columns=columnas)
+    
+    # Copia liviana: agregar columnas no modifica el CSV cacheado en `fuentes`
+    df = df.copy(deep=False)
+    for destino, funcion in mapeo.get('derivadas', {}).items():
+        df[destino] = funcion(df)
+        df_out[destino] = df[destino]
     
     # Limpiar nulos críticos
-    df_clean = df_clean.dropna(subset=['piloto_id'])
-    
-    # Reemplazar NaN con None (NULL en SQL)
-    df_clean = df_clean.where(pd.notna(df_clean), None)
+    df_out = df_out.dropna(subset=mapeo['requeridas'])
     
-    print(f"🔄 Transformados: {len(df_clean)} registros")
-    
-    # LOAD
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        for idx, row in df_clean.iterrows():
-            # Convertir row a lista y reemplazar cualquier NaN/nan residual con None
-            valores = []
-            for val in row:
-                if pd.isna(val):
-                    valores.append(None)
-                elif isinstance(val, float) and str(val).lower() == 'nan':
-                    valores.append(None)
-                else:
-                    valores.append(val)
-            
-            cursor.execute("""
-                INSERT IGNORE INTO dim_piloto (
-                    piloto_id, nombre, apellido, nombre_completo, codigo,
-                    numero, nacionalidad, fecha_nacimiento, url
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, tuple(valores))
-        
-        conn.commit()
-        print(f"✅ Cargados: {len(df_clean)} pilotos\n")
-    
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        conn.rollback()
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+    # Tipos nullables: enteros leídos como float por tener nulos vuelven a Int64 (44, no 44.0)
+    flotantes = df_out.select_dtypes('float').columns
+    df_out[flotantes] = df_out[flotantes].convert_dtypes(convert_string=False, convert_boolean=False)
+    return df_out
 
-def cargar_dim_constructor():
+def ejecutar_mapeo(tabla, mapeo, fuentes):
     """
-    2️⃣ DIMENSIÓN: CONSTRUCTOR
-    Fuente: constructors.csv
-    Transformación: Mapeo directo
+    Motor único de carga: EXTRACT → TRANSFORM (mapeo) → LOAD (carga masiva).
+    Devuelve el DataFrame transformado (incluidas las columnas no_cargar).
     """
-    print("-" * 80)
-    print("2️⃣  Cargando DIM_CONSTRUCTOR...")
-    print("-" * 80)
-    
-    # EXTRACT
-    df = read_csv_safe('constructors.csv')
-    print(f"📥 Extraídos: {len(df)} registros")
-    
-    # TRANSFORM
-    df_clean = df[['constructorId', 'name', 'constructorRef', 'nationality', 'url']].copy()
-    df_clean.columns = ['constructor_id', 'nombre', 'referencia', 'nacionalidad', 'url']
-    df_clean = df_clean.dropna(subset=['constructor_id'])
-    
-    # Reemplazar NaN con None (NULL en SQL)
-    df_clean = df_clean.where(pd.notna(df_clean), None)
-    
-    print(f"🔄 Transformados: {len(df_clean)} registros")
-    
-    # LOAD
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        for _, row in df_clean.iterrows():
-            # Convertir row a lista y reemplazar cualquier NaN residual con None
-            valores = [None if pd.isna(val) else val for val in row]
-            
-            cursor.execute("""
-                INSERT IGNORE INTO dim_constructor (
-                    constructor_id, nombre, referencia, nacionalidad, url
-                ) VALUES (%s, %s, %s, %s, %s)
-            """, tuple(valores))
-        
-        conn.commit()
-        print(f"✅ Cargados: {len(df_clean)} constructores\n")
+    separador = "=" if tabla.startswith('fact_') else "-"
+    print(separador * 80)
+    print(f"{mapeo['titulo']} ← {mapeo['fuente']}")
+    print(separador * 80)
     
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        conn.rollback()
-        raise
-    finally:
-        cursor.close()
-        conn.close()
-
-def cargar_dim_circuito():
-    """
-    3️⃣ DIMENSIÓN: CIRCUITO
-    Fuente: circuits.csv
-    Transformación: Conversión de coordenadas
-    """
-    print("-" * 80)
-    print("3️⃣  Cargando DIM_CIRCUITO...")
-    print("-" * 80)
+    inicio = time.perf_counter()
     
     # EXTRACT
-    df = read_csv_safe('circuits.csv')
-    print(f"📥 Extraídos: {len(df)} registros")
+    print(f"📥 Extraídos: {len(leer_fuente(mapeo['fuente'], fuentes))} registros")
     
     # TRANSFORM
-    df_clean = df[['circuitId', 'name', 'location', 'country', 'lat', 'lng', 'alt', 'url']].copy()
-    df_clean.columns = ['circuito_id', 'nombre', 'ubicacion', 'pais', 'latitud', 'longitud', 'altitud', 'url']
-    df_clean = df_clean.dropna(subset=['circuito_id'])
-    
-    # Reemplazar NaN con None (NULL en SQL)
-    df_clean = df_clean.where(pd.notna(df_clean), None)
-    
-    print(f"🔄 Transformados: {len(df_clean)} registros")
+    df_out = transformar_mapeo(mapeo, fuentes)
+    print(f"🔄 Transformados: {len(df_out)} registros")
     
     # LOAD
     conn = get_connection()
-    cursor = conn.cursor()
     
     try:
-        for _, row in df_clean.iterrows():
-            # Convertir row a lista y reemplazar cualquier NaN residual con None
-            valores = [None if pd.isna(val) else val for val in row]
-            
-            cursor.execute("""
-                INSERT IGNORE INTO dim_circuito (
-                    circuito_id, nombre, ubicacion, pais, latitud, longitud, altitud, url
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, tuple(valores))
-        
-        conn.commit()
-        print(f"✅ Cargados: {len(df_clean)} circuitos\n")
+        df_carga = df_out.drop(columns=mapeo.get('no_cargar', []))
+        verbo = mapeo.get('verbo', 'INSERT')
+        actualizar = None
+        if verbo == 'INSERT':
+            # Upsert por defecto: refrescar todas las columnas que no son clave
+            actualizar = mapeo.get('actualizar') or [
+                col for col in df_carga.columns if col not in mapeo['clave']
+            ]
+        cargados = cargar_bulk(conn, tabla, df_carga, verbo=verbo, actualizar=actualizar)
+        print(f"✅ Cargados: {cargados} registros en {tabla} ({time.perf_counter() - inicio:.2f}s)\n")
     
     except Exception as e:
         print(f"❌ Error: {e}")
         conn.rollback()
         raise
     finally:
-        cursor.close()
         conn.close()
+    
+    return df_out
 
-def cargar_dim_tiempo():
+# ============================================================================
+# SNAPSHOTS DERIVADOS (se calculan al terminar el PASO 3)
+# ============================================================================
+
+def actualizar_fact_campeon_temporada(df_pilotos, df_constructores):
     """
-    4️⃣ DIMENSIÓN: TIEMPO (GENERADA)
-    Fuente: Derivada de races.csv
-    Transformación: Generación dimensional completa
+    9️⃣ SNAPSHOT: CAMPEÓN POR TEMPORADA
+    Fuente: Derivada de fact_campeonato_piloto y fact_campeonato_constructor
+    Transformación: Líder de la última ronda de cada temporada (1 fila por año)
+    Solo temporadas completas: en una temporada en curso ninguna fila tiene
+    es_final_temporada (la última ronda del calendario aún no se disputó).
+    Se reemplaza en cada ejecución (REPLACE INTO) para reflejar temporadas nuevas
     """
     print("-" * 80)
-    print("4️⃣  Cargando DIM_TIEMPO (Generación Dimensional)...")
+    print("9️⃣  Actualizando FACT_CAMPEON_TEMPORADA...")
     print("-" * 80)
     
-    # EXTRACT - Obtener fechas únicas
-    df_races = read_csv_safe('races.csv')
-    fechas_unicas = pd.to_datetime(df_races['date']).dropna().unique()
+    # TRANSFORM - Quedarse con la posición 1 de la última ronda de temporadas completas
+    campeones_pil = df_pilotos[df_pilotos['es_final_temporada'] & (df_pilotos['posicion'] == 1)]
+    campeones_pil = campeones_pil[['anio', 'carrera_id', 'piloto_id', 'puntos', 'victorias']]
+    campeones_pil.columns = ['anio', 'carrera_id', 'piloto_id', 'puntos_piloto', 'victorias_piloto']
     
-    print(f"📥 Extraídas: {len(fechas_unicas)} fechas únicas")
+    campeones_con = df_constructores[
+        df_constructores['es_final_temporada'] & (df_constructores['posicion'] == 1)
+    ]
+    campeones_con = campeones_con[['anio', 'constructor_id', 'puntos', 'victorias']]
+    campeones_con.columns = ['anio', 'constructor_id', 'puntos_constructor', 'victorias_constructor']
     
-    # TRANSFORM - Generar atributos jerárquicos
-    dim_tiempo = []
+    # El campeonato de constructores existe desde 1958 → LEFT JOIN
+    df_snapshot = campeones_pil.merge(campeones_con, on='anio', how='left')
+    df_snapshot = df_snapshot.drop_duplicates(subset=['anio']).sort_values('anio')
+    df_snapshot = df_snapshot.astype({'constructor_id': 'Int64', 'victorias_constructor': 'Int64'})
     
-    meses_es = ['', 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-                'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
-    dias_es = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-    
-    for fecha in fechas_unicas:
-        fecha_dt = pd.Timestamp(fecha)
-        
-        # Generar tiempo_id en formato YYYYMMDD
-        tiempo_id = int(fecha_dt.strftime('%Y%m%d'))
-        
-        # Calcular atributos
-        anio = fecha_dt.year
-        mes = fecha_dt.month
-        dia = fecha_dt.day
-        trimestre = (mes - 1) // 3 + 1
-        decada = (anio // 10) * 10
-        nombre_mes = meses_es[mes]
-        dia_semana = dias_es[fecha_dt.dayofweek]
-        es_fin_semana = fecha_dt.dayofweek >= 5  # Sábado=5, Domingo=6
-        
-        dim_tiempo.append({
-            'tiempo_id': tiempo_id,
-            'fecha': fecha_dt.date(),
-            'anio': anio,
-            'mes': mes,
-            'dia': dia,
-            'trimestre': trimestre,
-            'decada': decada,
-            'nombre_mes': nombre_mes,
-            'dia_semana': dia_semana,
-            'es_fin_semana': es_fin_semana
-        })
-    
-    df_tiempo = pd.DataFrame(dim_tiempo)
-    print(f"🔄 Generados: {len(df_tiempo)} registros temporales")
+    print(f"🔄 Generadas: {len(df_snapshot)} temporadas")
     
     # LOAD
     conn = get_connection()
-    cursor = conn.cursor()
     
     try:
-        for _, row in df_tiempo.iterrows():
-            # Convertir boolean a int para MySQL (TINYINT)
-            row_vals = list(row)
-            row_vals[-1] = 1 if row_vals[-1] else 0  # es_fin_semana
-            
-            cursor.execute("""
-                INSERT IGNORE INTO dim_tiempo (
-                    tiempo_id, fecha, anio, mes, dia, trimestre, 
-                    decada, nombre_mes, dia_semana, es_fin_semana
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, tuple(row_vals))
-        
-        conn.commit()
-        print(f"✅ Cargados: {len(df_tiempo)} tiempos\n")
+        cargados = cargar_bulk(conn, 'fact_campeon_temporada', df_snapshot, verbo='REPLACE')
+        print(f"✅ Actualizadas: {cargados} temporadas\n")
     
     except Exception as e:
         print(f"❌ Error: {e}")
         conn.rollback()
         raise
     finally:
-        cursor.close()
         conn.close()
+    
+    return df_snapshot
 
-def cargar_dim_carrera():
+def actualizar_fact_pit_stop_temporada(df_paradas):
     """
-    5️⃣ DIMENSIÓN: CARRERA
-    Fuente: races.csv
-    Transformación: Validación de FK a circuito
-    DEPENDENCIA: Requiere dim_circuito cargada
+    1️⃣2️⃣ SNAPSHOT: RESUMEN DE PIT STOPS POR TEMPORADA
+    Fuente: Derivada de fact_pit_stop
+    Transformación: cantidad, media, mediana y p90 de duracion_ms por año
+    Solo se reescriben las temporadas cuya huella (hash de sus paradas) cambió
     """
     print("-" * 80)
-    print("5️⃣  Cargando DIM_CARRERA...")
+    print("1️⃣2️⃣ Actualizando FACT_PIT_STOP_TEMPORADA...")
     print("-" * 80)
     
-    # EXTRACT
-    df = read_csv_safe('races.csv')
-    print(f"📥 Extraídos: {len(df)} registros")
-    
-    # TRANSFORM
-    df_clean = df[['raceId', 'year', 'round', 'circuitId', 'name', 'date', 'time', 'url']].copy()
-    df_clean.columns = ['carrera_id', 'anio', 'ronda', 'circuito_id', 'nombre_gp', 'fecha', 'hora', 'url']
+    # TRANSFORM - Huella por temporada para detectar paradas nuevas o corregidas
+    df = df_paradas.sort_values(['carrera_id', 'piloto_id', 'parada'])
+    huellas = df.drop(columns=['anio']).groupby(df['anio']).apply(hash_particion).rename('huella')
     
-    # Limpiar registros sin circuito válido
-    df_clean = df_clean.dropna(subset=['carrera_id', 'circuito_id'])
+    duraciones = df.groupby('anio')['duracion_ms']
+    df_resumen = pd.DataFrame({
+        'cantidad_paradas': duraciones.count(),
+        'media_ms': duraciones.mean().round(1),
+        'mediana_ms': duraciones.median().round(1),
+        'p90_ms': duraciones.quantile(0.9).round(1),
+    }).join(huellas).reset_index()
     
-    # Reemplazar NaN con None (NULL en SQL)
-    df_clean = df_clean.where(pd.notna(df_clean), None)
-    
-    print(f"🔄 Transformados: {len(df_clean)} registros")
-    
-    # LOAD
+    # LOAD - Solo temporadas nuevas o con cambios
     conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        for _, row in df_clean.iterrows():
-            # Convertir row a lista y reemplazar cualquier NaN residual con None
-            valores = [None if pd.isna(val) else val for val in row]
-            
-            cursor.execute("""
-                INSERT IGNORE INTO dim_carrera (
-                    carrera_id, anio, ronda, circuito_id, nombre_gp, fecha, hora, url
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, tuple(valores))
+        cursor.execute("SELECT anio, huella FROM fact_pit_stop_temporada")
+        huellas_previas = dict(cursor.fetchall())
         
-        conn.commit()
-        print(f"✅ Cargados: {len(df_clean)} carreras\n")
+        cambios = df_resumen[df_resumen['huella'] != df_resumen['anio'].map(huellas_previas)]
+        actualizadas = cargar_bulk(conn, 'fact_pit_stop_temporada', cambios, verbo='REPLACE')
+        print(f"✅ Actualizadas: {actualizadas} de {len(df_resumen)} temporadas\n")
     
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -410,117 +697,8 @@ def cargar_dim_carrera():
     finally:
         cursor.close()
         conn.close()
-
-# ============================================================================
-# PASO 3: CARGAR TABLA DE HECHOS
-# ============================================================================
-
-def cargar_fact_resultado_carrera():
-    """
-    6️⃣ TABLA DE HECHOS: RESULTADO CARRERA
-    Fuente: results.csv
-    Transformación: Lookups + Métricas derivadas
-    DEPENDENCIA: Requiere TODAS las dimensiones cargadas
-    """
-    print("=" * 80)
-    print("6️⃣  Cargando FACT_RESULTADO_CARRERA...")
-    print("=" * 80)
-    
-    # EXTRACT
-    df_results = read_csv_safe('results.csv')
-    df_races = read_csv_safe('races.csv')
-    
-    print(f"📥 Extraídos: {len(df_results)} resultados")
-    
-    # TRANSFORM - Merge con races para obtener fecha y circuito
-    df = df_results.merge(df_races[['raceId', 'date', 'circuitId']], 
-                          left_on='raceId', right_on='raceId', how='left')
-    
-    # Generar tiempo_id desde fecha
-    df['fecha_dt'] = pd.to_datetime(df['date'])
-    df['tiempo_id'] = df['fecha_dt'].apply(lambda x: int(x.strftime('%Y%m%d')) if pd.notna(x) else None)
-    
-    # Calcular métricas derivadas
-    df['es_victoria'] = df['position'] == 1
-    df['es_podio'] = df['position'] <= 3
-    df['es_pole'] = df['grid'] == 1
-    df['es_punto'] = df['points'] > 0
-    df['completo_carrera'] = df['statusId'] == 1  # 1 = "Finished"
-    
-    # Seleccionar columnas finales
-    df_fact = df[[
-        'raceId', 'driverId', 'constructorId', 'circuitId', 'tiempo_id',
-        'points', 'position', 'grid', 'laps', 'milliseconds',
-        'fastestLap', 'fastestLapTime', 'fastestLapSpeed',
-        'es_victoria', 'es_podio', 'es_pole', 'es_punto', 'completo_carrera'
-    ]].copy()
-    
-    df_fact.columns = [
-        'carrera_id', 'piloto_id', 'constructor_id', 'circuito_id', 'tiempo_id',
-        'puntos', 'posicion_final', 'posicion_salida', 'vueltas_completadas', 'tiempo_final_ms',
-        'mejor_vuelta', 'tiempo_mejor_vuelta', 'velocidad_promedio',
-        'es_victoria', 'es_podio', 'es_pole', 'es_punto', 'completo_carrera'
-    ]
-    
-    # Limpiar nulos críticos
-    df_fact = df_fact.dropna(subset=['carrera_id', 'piloto_id', 'constructor_id', 'circuito_id', 'tiempo_id'])
-    
-    # Reemplazar NaN con None (NULL en SQL) ANTES de convertir booleanos
-    df_fact = df_fact.where(pd.notna(df_fact), None)
-    
-    print(f"🔄 Transformados: {len(df_fact)} registros")
-    
-    # LOAD
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        registros_cargados = 0
-        
-        for _, row in df_fact.iterrows():
-            try:
-                # Convertir a lista y manejar NaN + booleanos
-                row_vals = []
-                for i, val in enumerate(row):
-                    # Primero verificar si es NaN
-                    if pd.isna(val):
-                        row_vals.append(None)
-                    # Convertir booleanos a int (columnas 13-17)
-                    elif i >= 13 and i <= 17:
-                        row_vals.append(1 if val else 0)
-                    else:
-                        row_vals.append(val)
-                
-                cursor.execute("""
-                    INSERT IGNORE INTO fact_resultado_carrera (
-                        carrera_id, piloto_id, constructor_id, circuito_id, tiempo_id,
-                        puntos, posicion_final, posicion_salida, vueltas_completadas, tiempo_final_ms,
-                        mejor_vuelta, tiempo_mejor_vuelta, velocidad_promedio,
-                        es_victoria, es_podio, es_pole, es_punto, completo_carrera
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, tuple(row_vals))
-                
-                registros_cargados += 1
-                
-                # Commit cada 1000 registros
-                if registros_cargados % 1000 == 0:
-                    conn.commit()
-                    print(f"  💾 Progreso: {registros_cargados} registros...")
-            
-            except Exception as e:
-                print(f"  ⚠️  Error en registro: {e}")
-                continue
-        
-        conn.commit()
-        print(f"✅ Cargados: {registros_cargados} resultados de carrera\n")
     
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        conn.rollback()
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+    return df_resumen
 
 # ============================================================================
 # PASO 4: VERIFICACIÓN DE INTEGRIDAD
@@ -546,7 +724,13 @@ def verificar_integridad():
             'dim_circuito',
             'dim_tiempo',
             'dim_carrera',
-            'fact_resultado_carrera'
+            'fact_resultado_carrera',
+            'fact_campeonato_piloto',
+            'fact_campeonato_constructor',
+            'fact_campeon_temporada',
+            'fact_clasificacion',
+            'fact_pit_stop',
+            'fact_pit_stop_temporada'
         ]
         
         for tabla in tablas:
@@ -619,6 +803,103 @@ def verificar_integridad():
         cursor.close()
         conn.close()
 
+# ============================================================================
+# PASO 5: EXPORTACIÓN COLUMNAR (PARQUET)
+# ============================================================================
+
+def columna_temporada(df):
+    """Serie con la temporada de cada fila (anio o derivada de tiempo_id), o None"""
+    if 'anio' in df.columns:
+        return pd.to_numeric(df['anio']).astype('Int64')
+    if 'tiempo_id' in df.columns:
+        return (pd.to_numeric(df['tiempo_id']) // 10000).astype('Int64')
+    return None
+
+def exportar_parquet(tablas, directorio=EXPORT_DIR):
+    """
+    Exportar las tablas transformadas (ya en memoria) a Parquet.
+    Las tablas de TABLAS_PARTICIONADAS se particionan por año (anio=YYYY/,
+    estilo Hive) para permitir predicate pushdown; el resto (dimensiones y
+    snapshots por temporada) se escribe en un único archivo.
+    Las particiones cuyo contenido no cambió desde la última exportación
+    (según el manifiesto _manifiesto.json) no se reescriben.
+    """
+    print("=" * 80)
+    print("PASO 5: EXPORTANDO ESQUEMA ESTRELLA A PARQUET")
+    print("=" * 80)
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("⚠️  pyarrow no está instalado, se omite la exportación (pip install pyarrow)\n")
+        return
+    
+    ruta_manifiesto = os.path.join(directorio, '_manifiesto.json')
+    manifiesto = {}
+    if os.path.exists(ruta_manifiesto):
+        with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    
+    for tabla, df in tablas.items():
+        temporada = None
+        if tabla in TABLAS_PARTICIONADAS:
+            temporada = columna_temporada(df)
+            # La columna de partición vive en la ruta, no dentro del archivo
+            df = df.drop(columns=['anio'], errors='ignore')
+        df = df.reset_index(drop=True)
+        
+        # Un único esquema Arrow para toda la tabla (tipos consistentes entre particiones)
+        tabla_arrow = pa.Table.from_pandas(df, preserve_index=False)
+        esquema = tabla_arrow.schema.remove_metadata()
+        
+        if temporada is None:
+            particiones = {'': None}
+        else:
+            temporada = temporada.reset_index(drop=True)
+            particiones = {
+                f"anio={int(anio)}": indices
+                for anio, indices in temporada.groupby(temporada).indices.items()
+            }
+        
+        hashes_previos = manifiesto.get(tabla, {})
+        hashes = {}
+        escritas = 0
+        
+        for particion, indices in particiones.items():
+            df_part = df if indices is None else df.iloc[indices]
+            hashes[particion] = hash_particion(df_part, esquema)
+            ruta = os.path.join(directorio, tabla, particion, 'part-0.parquet')
+            
+            if hashes_previos.get(particion) == hashes[particion] and os.path.exists(ruta):
+                continue
+            
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            datos = tabla_arrow if indices is None else tabla_arrow.take(pa.array(indices))
+            pq.write_table(datos, ruta, compression='zstd', write_statistics=True)
+            escritas += 1
+        
+        # Eliminar particiones que ya no existen en los datos
+        for particion in set(hashes_previos) - set(hashes):
+            ruta = os.path.join(directorio, tabla, particion, 'part-0.parquet')
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            carpeta = os.path.dirname(ruta)
+            if particion and os.path.isdir(carpeta) and not os.listdir(carpeta):
+                os.rmdir(carpeta)
+        
+        manifiesto[tabla] = hashes
+        if temporada is None:
+            print(f"  📦 {tabla:30s}: {'escrita' if escritas else 'sin cambios'} (archivo único)")
+        else:
+            print(f"  📦 {tabla:30s}: {escritas} de {len(hashes)} partición(es) escritas")
+    
+    os.makedirs(directorio, exist_ok=True)
+    with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+    
+    print(f"✅ Exportación completada en {directorio}\n")
+
 # ============================================================================
 # MAIN - EJECUTAR ETL COMPLETO
 # ============================================================================
@@ -642,11 +923,12 @@ def main():
         print("=" * 80)
         print()
         
-        cargar_dim_piloto()
-        cargar_dim_constructor()
-        cargar_dim_circuito()
-        cargar_dim_tiempo()
-        cargar_dim_carrera()
+        # DataFrames transformados: se reutilizan en la exportación Parquet
+        tablas = {}
+        fuentes = {}
+        for tabla, mapeo in MAPEOS.items():
+            if tabla.startswith('dim_'):
+                tablas[tabla] = ejecutar_mapeo(tabla, mapeo, fuentes)
         
         # Paso 3: Cargar tabla de hechos
         print("=" * 80)
@@ -654,11 +936,21 @@ def main():
         print("=" * 80)
         print()
         
-        cargar_fact_resultado_carrera()
+        for tabla, mapeo in MAPEOS.items():
+            if tabla.startswith('fact_'):
+                tablas[tabla] = ejecutar_mapeo(tabla, mapeo, fuentes)
+        
+        tablas['fact_campeon_temporada'] = actualizar_fact_campeon_temporada(
+            tablas['fact_campeonato_piloto'], tablas['fact_campeonato_constructor']
+        )
+        tablas['fact_pit_stop_temporada'] = actualizar_fact_pit_stop_temporada(tablas['fact_pit_stop'])
         
         # Paso 4: Verificar
         verificar_integridad()
         
+        # Paso 5: Exportar a Parquet (solo tras una carga exitosa)
+        exportar_parquet(tablas)
+        
         print("\n🎉 ¡ETL COMPLETADO EXITOSAMENTE! 🎉\n")
     
     except Exception as e:
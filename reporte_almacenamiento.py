@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Reporte de almacenamiento físico de fact_resultado_carrera
+Compara el layout actual contra el layout compacto (sql/fact_resultado_compacto.sql):
+tamaño de datos e índices, bytes por fila y tiempo de escaneo completo.
+Ejecutar DESPUÉS del ETL (necesita fact_resultado_carrera cargada).
+
+Uso:
+    python reporte_almacenamiento.py               # layout compacto (ROW_FORMAT=DYNAMIC)
+    python reporte_almacenamiento.py --comprimir   # + compresión de páginas InnoDB
+"""
+
+import argparse
+import time
+
+from etl import get_connection, dividir_sentencias, leer_migracion
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+TABLA_ACTUAL = 'fact_resultado_carrera'
+TABLA_COMPACTA = 'fact_resultado_carrera_compacta'
+DDL_COMPACTO = 'sql/fact_resultado_compacto.sql'
+
+# Escaneo completo representativo: agrega métricas y flags de toda la tabla
+CONSULTA_ESCANEO = """
+    SELECT COUNT(*), SUM(puntos), AVG(posicion_final), SUM(vueltas_completadas),
+           SUM(es_victoria), SUM(es_podio), SUM(es_pole)
+    FROM {tabla} FORCE INDEX (PRIMARY)
+"""
+
+REPETICIONES = 5
+
+# ============================================================================
+# FUNCIONES
+# ============================================================================
+
+def crear_tabla_compacta(conn, comprimir, key_block_size):
+    """Crear y cargar la tabla compacta desde la tabla actual"""
+    cursor = conn.cursor()
+
+    try:
+        sql_script, _ = leer_migracion(DDL_COMPACTO)
+        for sentencia in dividir_sentencias(sql_script):
+            cursor.execute(sentencia)
+
+        if comprimir:
+            # Requiere innodb_file_per_table=ON (valor por defecto en MySQL 8)
+            cursor.execute(
+                f"ALTER TABLE {TABLA_COMPACTA} ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE={key_block_size}"
+            )
+
+        conn.commit()
+    finally:
+        cursor.close()
+
+def medir_tamanio(cursor, tabla):
+    """Tamaño de datos e índices según information_schema (tras ANALYZE TABLE)"""
+    cursor.execute(f"ANALYZE TABLE {tabla}")
+    cursor.fetchall()
+
+    cursor.execute("""
+        SELECT TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH, ROW_FORMAT, CREATE_OPTIONS
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (tabla,))
+    filas, datos, indices, row_format, opciones = cursor.fetchone()
+
+    return {
+        'filas': filas,
+        'datos': datos,
+        'indices': indices,
+        'row_format': row_format,
+        'opciones': opciones or '',
+    }
+
+def medir_escaneo(cursor, tabla):
+    """Mejor tiempo (ms) de REPETICIONES escaneos completos, tras un calentamiento"""
+    consulta = CONSULTA_ESCANEO.format(tabla=tabla)
+    cursor.execute(consulta)
+    cursor.fetchall()
+
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        cursor.execute(consulta)
+        cursor.fetchall()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    return min(tiempos)
+
+def formatear_bytes(valor):
+    """Bytes → KB/MB legibles"""
+    if valor >= 1024 * 1024:
+        return f"{valor / (1024 * 1024):.2f} MB"
+    return f"{valor / 1024:.1f} KB"
+
+def imprimir_comparacion(actual, compacta):
+    """Tabla comparativa de ambos layouts"""
+    print("\n" + "=" * 78)
+    print(f"{'':24s}{'ACTUAL':>18s}{'COMPACTA':>18s}{'VARIACIÓN':>18s}")
+    print("=" * 78)
+
+    print(f"{'Row format':24s}{actual['row_format']:>18s}{compacta['row_format']:>18s}")
+    print(f"{'Filas (aprox.)':24s}{actual['filas']:>18,}{compacta['filas']:>18,}")
+
+    for nombre, clave in [('Datos', 'datos'), ('Índices', 'indices'), ('Total', 'total')]:
+        a, c = actual[clave], compacta[clave]
+        variacion = f"{(c - a) / a * 100:+.1f}%" if a else "-"
+        print(f"{nombre:24s}{formatear_bytes(a):>18s}{formatear_bytes(c):>18s}{variacion:>18s}")
+
+    a, c = actual['bytes_fila'], compacta['bytes_fila']
+    print(f"{'Bytes por fila (datos)':24s}{a:>18.1f}{c:>18.1f}{(c - a) / a * 100 if a else 0:>+17.1f}%")
+
+    a, c = actual['escaneo_ms'], compacta['escaneo_ms']
+    print(f"{'Escaneo completo (ms)':24s}{a:>18.2f}{c:>18.2f}{(c - a) / a * 100:>+17.1f}%")
+    print("=" * 78)
+
+def main():
+    """Generar el reporte de almacenamiento"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--comprimir', action='store_true',
+                        help='Aplicar ROW_FORMAT=COMPRESSED a la tabla compacta')
+    parser.add_argument('--key-block-size', type=int, default=8, choices=[1, 2, 4, 8, 16],
+                        help='KEY_BLOCK_SIZE en KB para la compresión (default: 8)')
+    args = parser.parse_args()
+
+    print("\n")
+    print("╔" + "=" * 68 + "╗")
+    print("║" + " " * 12 + "REPORTE DE ALMACENAMIENTO - FACT_RESULTADO" + " " * 14 + "║")
+    print("╚" + "=" * 68 + "╝")
+    print()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        # Estadísticas de information_schema sin cache (MySQL 8 las cachea 24 h)
+        cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+
+        print(f"🔧 Creando {TABLA_COMPACTA} desde {TABLA_ACTUAL}...")
+        crear_tabla_compacta(conn, args.comprimir, args.key_block_size)
+
+        resultados = {}
+        for tabla in [TABLA_ACTUAL, TABLA_COMPACTA]:
+            print(f"📏 Midiendo {tabla}...")
+            medida = medir_tamanio(cursor, tabla)
+            medida['total'] = medida['datos'] + medida['indices']
+            medida['bytes_fila'] = medida['datos'] / medida['filas'] if medida['filas'] else 0
+            medida['escaneo_ms'] = medir_escaneo(cursor, tabla)
+            resultados[tabla] = medida
+
+        imprimir_comparacion(resultados[TABLA_ACTUAL], resultados[TABLA_COMPACTA])
+
+        if args.comprimir:
+            print(f"\n💡 Tabla compacta con {resultados[TABLA_COMPACTA]['opciones']}")
+        print(f"\n✅ {TABLA_COMPACTA} queda creada para consultas de prueba\n")
+
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ CREATE DATABASE IF NOT EXISTS f1_datawarehouse;
 USE f1_datawarehouse;
 
 -- Eliminar tablas si existen (para poder recrear)
+DROP TABLE IF EXISTS fact_clasificacion;
+DROP TABLE IF EXISTS fact_campeon_temporada;
+DROP TABLE IF EXISTS fact_campeonato_constructor;
+DROP TABLE IF EXISTS fact_campeonato_piloto;
 DROP TABLE IF EXISTS fact_resultado_carrera;
 DROP TABLE IF EXISTS dim_carrera;
 DROP TABLE IF EXISTS dim_tiempo;
@@ -105,7 +109,7 @@ CREATE TABLE dim_carrera (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Dimensión de carreras/Grandes Premios';
 
 -- ============================================================================
--- PASO 2: CREAR TABLA DE HECHOS
+-- PASO 2: CREAR TABLAS DE HECHOS
 -- ============================================================================
 
 -- ----------------------------------------------------------------------------
@@ -152,6 +156,116 @@ CREATE TABLE fact_resultado_carrera (
     FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Tabla de hechos: Resultados de pilotos por carrera';
 
+-- ----------------------------------------------------------------------------
+-- TABLA DE HECHOS: CAMPEONATO DE PILOTOS
+-- Fuente: driver_standings.csv
+-- Descripción: Posición y puntos acumulados de cada piloto tras cada carrera
+-- Granularidad: Un registro = Un piloto después de una carrera específica
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_campeonato_piloto (
+    -- CLAVES FORÁNEAS (Dimensiones)
+    carrera_id           INT NOT NULL,
+    piloto_id            INT NOT NULL,
+    tiempo_id            INT NOT NULL,
+    
+    -- MÉTRICAS ACUMULADAS EN LA TEMPORADA
+    puntos               DECIMAL(6,2),
+    posicion             INT,
+    victorias            INT,
+    
+    -- MÉTRICAS DERIVADAS (Calculadas en ETL)
+    es_final_temporada   BOOLEAN,
+    
+    PRIMARY KEY (carrera_id, piloto_id),
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (piloto_id) REFERENCES dim_piloto(piloto_id),
+    FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Tabla de hechos: Campeonato de pilotos por carrera';
+
+-- ----------------------------------------------------------------------------
+-- TABLA DE HECHOS: CAMPEONATO DE CONSTRUCTORES
+-- Fuente: constructor_standings.csv
+-- Descripción: Posición y puntos acumulados de cada equipo tras cada carrera
+-- Granularidad: Un registro = Un constructor después de una carrera específica
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_campeonato_constructor (
+    -- CLAVES FORÁNEAS (Dimensiones)
+    carrera_id           INT NOT NULL,
+    constructor_id       INT NOT NULL,
+    tiempo_id            INT NOT NULL,
+    
+    -- MÉTRICAS ACUMULADAS EN LA TEMPORADA
+    puntos               DECIMAL(6,2),
+    posicion             INT,
+    victorias            INT,
+    
+    -- MÉTRICAS DERIVADAS (Calculadas en ETL)
+    es_final_temporada   BOOLEAN,
+    
+    PRIMARY KEY (carrera_id, constructor_id),
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (constructor_id) REFERENCES dim_constructor(constructor_id),
+    FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Tabla de hechos: Campeonato de constructores por carrera';
+
+-- ----------------------------------------------------------------------------
+-- SNAPSHOT: CAMPEÓN POR TEMPORADA
+-- Fuente: Derivada de fact_campeonato_piloto / fact_campeonato_constructor
+-- Descripción: Clasificación final precalculada (campeones de cada año)
+-- Granularidad: Un registro = Una temporada
+-- Se refresca en cada ejecución del ETL (REPLACE INTO)
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_campeon_temporada (
+    anio                   INT PRIMARY KEY,
+    carrera_id             INT NOT NULL,
+    
+    -- CAMPEÓN DE PILOTOS
+    piloto_id              INT NOT NULL,
+    puntos_piloto          DECIMAL(6,2),
+    victorias_piloto       INT,
+    
+    -- CAMPEÓN DE CONSTRUCTORES (NULL antes de 1958)
+    constructor_id         INT,
+    puntos_constructor     DECIMAL(6,2),
+    victorias_constructor  INT,
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (piloto_id) REFERENCES dim_piloto(piloto_id),
+    FOREIGN KEY (constructor_id) REFERENCES dim_constructor(constructor_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Snapshot: Campeones de pilotos y constructores por temporada';
+
+-- ----------------------------------------------------------------------------
+-- TABLA DE HECHOS: CLASIFICACIÓN (QUALY)
+-- Fuente: qualifying.csv
+-- Descripción: Tiempos de Q1/Q2/Q3 de cada piloto (en milisegundos)
+-- Granularidad: Un registro = Un piloto en la clasificación de una carrera
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_clasificacion (
+    -- CLAVES FORÁNEAS (Dimensiones)
+    carrera_id           INT NOT NULL,
+    piloto_id            INT NOT NULL,
+    constructor_id       INT NOT NULL,
+    tiempo_id            INT NOT NULL,
+    
+    -- MÉTRICAS NUMÉRICAS
+    posicion             INT,
+    q1_ms                INT,
+    q2_ms                INT,
+    q3_ms                INT,
+    
+    -- MÉTRICAS DERIVADAS (Calculadas en ETL)
+    mejor_tiempo_ms      INT,
+    
+    PRIMARY KEY (carrera_id, piloto_id),
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (piloto_id) REFERENCES dim_piloto(piloto_id),
+    FOREIGN KEY (constructor_id) REFERENCES dim_constructor(constructor_id),
+    FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Tabla de hechos: Tiempos de clasificación por piloto y carrera';
+
 -- ============================================================================
 -- PASO 3: CREAR ÍNDICES (Para optimizar consultas)
 -- ============================================================================
@@ -163,6 +277,9 @@ CREATE INDEX idx_fact_circuito ON fact_resultado_carrera(circuito_id);
 CREATE INDEX idx_fact_tiempo ON fact_resultado_carrera(tiempo_id);
 CREATE INDEX idx_fact_victoria ON fact_resultado_carrera(es_victoria);
 CREATE INDEX idx_fact_podio ON fact_resultado_carrera(es_podio);
+CREATE INDEX idx_camp_piloto_final ON fact_campeonato_piloto(es_final_temporada, piloto_id);
+CREATE INDEX idx_camp_constructor_final ON fact_campeonato_constructor(es_final_temporada, constructor_id);
+CREATE INDEX idx_clasif_piloto ON fact_clasificacion(piloto_id);
 
 -- Índices en dimensiones
 CREATE INDEX idx_carrera_anio ON dim_carrera(anio);
@@ -172,7 +289,7 @@ CREATE INDEX idx_piloto_nombre ON dim_piloto(nombre_completo);
 
 -- ============================================================================
 -- ✅ DDL COMPLETADO!
--- Total: 5 dimensiones + 1 tabla de hechos + índices
+-- Total: 5 dimensiones + 4 tablas de hechos + 1 snapshot + índices
 -- ============================================================================
 
 
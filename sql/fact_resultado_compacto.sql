@@ -0,0 +1,88 @@
+-- ============================================================================
+-- F1 DATA WAREHOUSE - OPCIÓN DE ALMACENAMIENTO COMPACTO
+-- Tabla: fact_resultado_carrera_compacta (misma granularidad y claves)
+-- Uso: la crea y carga reporte_almacenamiento.py para comparar contra
+--      fact_resultado_carrera. No forma parte de MIGRACIONES; para adoptarla
+--      como tabla principal, agregarla como una migración nueva.
+-- ============================================================================
+
+DROP TABLE IF EXISTS fact_resultado_carrera_compacta;
+
+-- ----------------------------------------------------------------------------
+-- TABLA DE HECHOS: RESULTADO CARRERA (LAYOUT COMPACTO)
+-- Cambios respecto de fact_resultado_carrera:
+--   * Métricas con enteros del tamaño justo (rango observado 1950-2024):
+--       posicion_final 1-33, posicion_salida 0-34, vueltas 0-200,
+--       mejor_vuelta 1-85 → TINYINT UNSIGNED (1 byte, máx. 255)
+--       tiempo_mejor_vuelta ≤ 202.300 ms → MEDIUMINT UNSIGNED (máx. ~4,6 h)
+--       tiempo_final_ms ≤ 15.090.540 ms → INT UNSIGNED (antes BIGINT)
+--   * Los 5 flags es_* se empaquetan en un único TINYINT (bits 0-4) y se
+--     exponen como columnas generadas VIRTUAL con los mismos nombres, por lo
+--     que las consultas existentes funcionan sin cambios.
+--   * Las claves siguen siendo INT: las FK exigen el mismo tipo que la PK
+--     referenciada en las dimensiones.
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_resultado_carrera_compacta (
+    -- CLAVES FORÁNEAS (Dimensiones)
+    carrera_id           INT NOT NULL,
+    piloto_id            INT NOT NULL,
+    constructor_id       INT NOT NULL,
+    circuito_id          INT NOT NULL,
+    tiempo_id            INT NOT NULL,
+    
+    -- MÉTRICAS NUMÉRICAS
+    puntos               DECIMAL(5,2),
+    posicion_final       TINYINT UNSIGNED,
+    posicion_salida      TINYINT UNSIGNED,
+    vueltas_completadas  TINYINT UNSIGNED,
+    tiempo_final_ms      INT UNSIGNED,
+    
+    -- MÉTRICAS ADICIONALES
+    mejor_vuelta         TINYINT UNSIGNED,
+    tiempo_mejor_vuelta  MEDIUMINT UNSIGNED,
+    velocidad_promedio   DECIMAL(6,2),
+    
+    -- MÉTRICAS DERIVADAS EMPAQUETADAS
+    -- bit 0 = victoria, 1 = podio, 2 = pole, 3 = punto, 4 = completó carrera
+    flags                TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    
+    -- Columnas de compatibilidad (no ocupan espacio en la fila)
+    es_victoria          BOOLEAN AS ((flags & 1) <> 0) VIRTUAL,
+    es_podio             BOOLEAN AS ((flags & 2) <> 0) VIRTUAL,
+    es_pole              BOOLEAN AS ((flags & 4) <> 0) VIRTUAL,
+    es_punto             BOOLEAN AS ((flags & 8) <> 0) VIRTUAL,
+    completo_carrera     BOOLEAN AS ((flags & 16) <> 0) VIRTUAL,
+    
+    PRIMARY KEY (carrera_id, piloto_id),
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (piloto_id) REFERENCES dim_piloto(piloto_id),
+    FOREIGN KEY (constructor_id) REFERENCES dim_constructor(constructor_id),
+    FOREIGN KEY (circuito_id) REFERENCES dim_circuito(circuito_id),
+    FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=DYNAMIC COMMENT='Tabla de hechos: Resultados de pilotos por carrera (layout compacto)';
+
+-- Mismos índices que fact_resultado_carrera (los de flags, sobre las columnas virtuales)
+CREATE INDEX idx_factc_piloto ON fact_resultado_carrera_compacta(piloto_id);
+CREATE INDEX idx_factc_constructor ON fact_resultado_carrera_compacta(constructor_id);
+CREATE INDEX idx_factc_circuito ON fact_resultado_carrera_compacta(circuito_id);
+CREATE INDEX idx_factc_tiempo ON fact_resultado_carrera_compacta(tiempo_id);
+CREATE INDEX idx_factc_victoria ON fact_resultado_carrera_compacta(es_victoria);
+CREATE INDEX idx_factc_podio ON fact_resultado_carrera_compacta(es_podio);
+
+-- Copiar los datos desde la tabla actual empaquetando los flags
+INSERT INTO fact_resultado_carrera_compacta (
+    carrera_id, piloto_id, constructor_id, circuito_id, tiempo_id,
+    puntos, posicion_final, posicion_salida, vueltas_completadas, tiempo_final_ms,
+    mejor_vuelta, tiempo_mejor_vuelta, velocidad_promedio, flags
+)
+SELECT
+    carrera_id, piloto_id, constructor_id, circuito_id, tiempo_id,
+    puntos, posicion_final, posicion_salida, vueltas_completadas, tiempo_final_ms,
+    mejor_vuelta, tiempo_mejor_vuelta, velocidad_promedio,
+    (COALESCE(es_victoria, 0) <> 0)
+        | ((COALESCE(es_podio, 0) <> 0) << 1)
+        | ((COALESCE(es_pole, 0) <> 0) << 2)
+        | ((COALESCE(es_punto, 0) <> 0) << 3)
+        | ((COALESCE(completo_carrera, 0) <> 0) << 4)
+FROM fact_resultado_carrera;
@@ -0,0 +1,51 @@
+-- ============================================================================
+-- F1 DATA WAREHOUSE - MIGRACIÓN 002
+-- Paradas en boxes (pit stops) + resumen precalculado por temporada
+-- Pregunta 12: ¿Cómo evolucionó el tiempo de pit stop a lo largo de los años?
+-- ============================================================================
+
+-- ----------------------------------------------------------------------------
+-- TABLA DE HECHOS: PIT STOP
+-- Fuente: pit_stops.csv
+-- Descripción: Duración de cada parada en boxes
+-- Granularidad: Un registro = Una parada de un piloto en una carrera
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_pit_stop (
+    -- CLAVES FORÁNEAS (Dimensiones)
+    carrera_id           INT NOT NULL,
+    piloto_id            INT NOT NULL,
+    tiempo_id            INT NOT NULL,
+    
+    -- ATRIBUTOS DE LA PARADA
+    parada               INT NOT NULL,
+    vuelta               INT,
+    hora                 TIME,
+    
+    -- MÉTRICAS NUMÉRICAS
+    duracion_ms          INT,
+    
+    PRIMARY KEY (carrera_id, piloto_id, parada),
+    
+    FOREIGN KEY (carrera_id) REFERENCES dim_carrera(carrera_id),
+    FOREIGN KEY (piloto_id) REFERENCES dim_piloto(piloto_id),
+    FOREIGN KEY (tiempo_id) REFERENCES dim_tiempo(tiempo_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Tabla de hechos: Paradas en boxes por piloto y carrera';
+
+CREATE INDEX idx_pit_tiempo ON fact_pit_stop(tiempo_id);
+
+-- ----------------------------------------------------------------------------
+-- SNAPSHOT: RESUMEN DE PIT STOPS POR TEMPORADA
+-- Fuente: Derivada de fact_pit_stop
+-- Descripción: Estadísticas de duración precalculadas (una fila por año)
+-- Se refrescan solo las temporadas cuyas paradas cambiaron (columna huella)
+-- ----------------------------------------------------------------------------
+CREATE TABLE fact_pit_stop_temporada (
+    anio                 INT PRIMARY KEY,
+    cantidad_paradas     INT NOT NULL,
+    media_ms             DECIMAL(10,1),
+    mediana_ms           DECIMAL(10,1),
+    p90_ms               DECIMAL(10,1),
+    
+    -- Hash de las paradas de la temporada (detecta paradas nuevas)
+    huella               CHAR(64) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Snapshot: Estadísticas de pit stops por temporada';
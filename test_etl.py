@@ -0,0 +1,349 @@
+"""
+Tests de las funciones puras del ETL (no requieren MySQL)
+Ejecutar: python -m pytest -q
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import etl
+from etl import (MAPEOS, actualizar_fact_campeon_temporada, actualizar_fact_pit_stop_temporada,
+                 dividir_sentencias, exportar_parquet, leer_migracion, parsear_tiempo_ms,
+                 transformar_mapeo)
+
+class ConexionFalsa:
+    """Conexión MySQL mínima: registra las sentencias y devuelve filas fijas"""
+
+    def __init__(self, filas=()):
+        self.filas = list(filas)
+        self.sentencias = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.sentencias.append((sql, params))
+
+    def fetchall(self):
+        return self.filas
+
+    def commit(self):
+        pass
+
+    rollback = close = commit
+
+# ============================================================================
+# parsear_tiempo_ms
+# ============================================================================
+
+CASOS_TIEMPO = [
+    # (entrada, milisegundos esperados; None = nulo)
+    ('1:27.452', 87452),          # m:ss.sss (vuelta rápida / qualy)
+    ('0:59.001', 59001),
+    ('1:34:50.616', 5690616),     # h:mm:ss.sss (tiempo de carrera)
+    ('26.898', 26898),            # ss.sss (duración de pit stop)
+    ('16:44.718', 1004718),       # pit stop largo bajo bandera roja
+    ('90', 90000),                # segundos enteros
+    ('1:27.4', 87400),            # fracción corta
+    ('  1:27.452 ', 87452),       # espacios alrededor
+    ('\\N', None),                # nulo de los CSV de Ergast
+    ('', None),
+    ('   ', None),
+    (None, None),
+    (float('nan'), None),
+    ('+5.478', None),             # diferencia al ganador, no un tiempo
+    ('1:27:', None),
+    ('abc', None),
+    ('1 Lap', None),
+]
+
+@pytest.mark.parametrize('entrada, esperado', CASOS_TIEMPO)
+def test_parsear_tiempo_ms(entrada, esperado):
+    resultado = parsear_tiempo_ms(pd.Series([entrada], dtype=object))
+
+    assert str(resultado.dtype) == 'Int64'
+    if esperado is None:
+        assert pd.isna(resultado.iloc[0])
+    else:
+        assert resultado.iloc[0] == esperado
+
+def test_parsear_tiempo_ms_conserva_indice():
+    serie = pd.Series(['1:27.452', None, '26.898'], index=[10, 20, 30])
+    resultado = parsear_tiempo_ms(serie)
+
+    assert list(resultado.index) == [10, 20, 30]
+    assert resultado.tolist()[0] == 87452 and resultado.tolist()[2] == 26898
+
+# ============================================================================
+# leer_migracion
+# ============================================================================
+
+SCRIPT_MIGRACION = "-- Migración de prueba: año, ñandú\nCREATE TABLE t (a INT);\n"
+
+@pytest.mark.parametrize('contenido', [
+    SCRIPT_MIGRACION.encode('utf-8'),                              # UTF-8 con LF
+    SCRIPT_MIGRACION.replace('\n', '\r\n').encode('utf-8'),         # checkout CRLF
+    b'\xef\xbb\xbf' + SCRIPT_MIGRACION.encode('utf-8'),             # re-guardado con BOM
+    SCRIPT_MIGRACION.encode('latin-1'),                            # latin-1 (Windows)
+])
+def test_leer_migracion_checksum_estable(tmp_path, contenido):
+    ruta = tmp_path / 'migracion.sql'
+    ruta.write_bytes(contenido)
+
+    sql_script, checksum = leer_migracion(str(ruta))
+    ruta.write_bytes(SCRIPT_MIGRACION.encode('utf-8'))
+
+    assert sql_script == SCRIPT_MIGRACION
+    assert checksum == leer_migracion(str(ruta))[1]
+
+# ============================================================================
+# dividir_sentencias
+# ============================================================================
+
+CASOS_SQL = [
+    # (script, sentencias esperadas)
+    ("SELECT 1; SELECT 2;", ["SELECT 1", "SELECT 2"]),
+    ("SELECT 1", ["SELECT 1"]),                                   # sin ';' final
+    (";;  ;\n", []),                                              # sentencias vacías
+    ("SELECT 'a;b'; SELECT 2", ["SELECT 'a;b'", "SELECT 2"]),     # ';' en literal
+    ('SELECT "a;b"', ['SELECT "a;b"']),
+    ("SELECT `a;b` FROM t", ["SELECT `a;b` FROM t"]),              # identificador
+    ("SELECT 'it''s; ok'; SELECT 2", ["SELECT 'it''s; ok'", "SELECT 2"]),   # comilla doblada
+    ("SELECT 'x\\';y'; SELECT 2", ["SELECT 'x\\';y'", "SELECT 2"]),      # escape con barra
+    ("SELECT 'a\\\\'; SELECT 2", ["SELECT 'a\\\\'", "SELECT 2"]),    # barra escapada
+    ("SELECT 1 -- comentario; no separa\n; SELECT 2", ["SELECT 1", "SELECT 2"]),
+    ("SELECT 1 --\n; SELECT 2", ["SELECT 1", "SELECT 2"]),          # '--' al final de línea
+    ("SELECT 1--1; SELECT 2", ["SELECT 1--1", "SELECT 2"]),         # '--' sin espacio: resta
+    ("SELECT 1 # comentario; no separa\n; SELECT 2", ["SELECT 1", "SELECT 2"]),
+    ("SELECT /* a; b */ 1; SELECT 2", ["SELECT   1", "SELECT 2"]),
+    ("/*!40101 SET NAMES utf8mb4 */; SELECT 2", ["/*!40101 SET NAMES utf8mb4 */", "SELECT 2"]),
+    ("-- solo comentario;\n/* otro; */", []),
+    ("CREATE TABLE t (a INT COMMENT 'uno; dos') COMMENT='tabla; x';",
+     ["CREATE TABLE t (a INT COMMENT 'uno; dos') COMMENT='tabla; x'"]),
+]
+
+@pytest.mark.parametrize('script, esperado', CASOS_SQL)
+def test_dividir_sentencias(script, esperado):
+    assert dividir_sentencias(script) == esperado
+
+def test_dividir_sentencias_ddl_del_repo():
+    ruta = os.path.join(os.path.dirname(__file__), 'sql', 'create_tables.sql')
+    sql_script, _ = leer_migracion(ruta)
+    sentencias = dividir_sentencias(sql_script)
+
+    assert sentencias[0] == 'CREATE DATABASE IF NOT EXISTS f1_datawarehouse'
+    assert all(';' not in sentencia for sentencia in sentencias)
+    assert sum(sentencia.startswith('CREATE TABLE') for sentencia in sentencias) == 10
+
+# ============================================================================
+# actualizar_fact_campeon_temporada
+# ============================================================================
+
+# 2020: completa | 2021: en curso (falta la ronda 3) | 1950: sin campeonato de constructores
+RACES = pd.DataFrame({
+    'raceId': [1, 2, 3, 4, 5, 6],
+    'year':   [2020, 2020, 2021, 2021, 2021, 1950],
+    'round':  [1, 2, 1, 2, 3, 1],
+    'date':   ['2020-07-05', '2020-12-13', '2021-03-28', '2021-04-18', '2021-05-02', '1950-05-13'],
+})
+STANDINGS_PILOTOS = pd.DataFrame({
+    'raceId':   [1, 1, 2, 2, 3, 3, 4, 4, 6],
+    'driverId': [10, 20, 10, 20, 10, 20, 10, 20, 30],
+    'points':   [25, 18, 43, 50, 25, 18, 43, 50, 9],
+    'position': [1, 2, 2, 1, 1, 2, 2, 1, 1],
+    'wins':     [1, 0, 1, 1, 1, 0, 1, 1, 1],
+})
+STANDINGS_CONSTRUCTORES = pd.DataFrame({
+    'raceId':        [1, 2, 3, 4],
+    'constructorId': [100, 100, 200, 200],
+    'points':        [40, 80, 40, 80],
+    'position':      [1, 1, 1, 1],
+    'wins':          [1, 2, 1, 2],
+})
+
+@pytest.fixture
+def campeones(monkeypatch):
+    monkeypatch.setattr(etl, 'get_connection', ConexionFalsa)
+    fuentes = {
+        'races.csv': RACES,
+        'driver_standings.csv': STANDINGS_PILOTOS,
+        'constructor_standings.csv': STANDINGS_CONSTRUCTORES,
+    }
+    df_pilotos = transformar_mapeo(MAPEOS['fact_campeonato_piloto'], fuentes)
+    df_constructores = transformar_mapeo(MAPEOS['fact_campeonato_constructor'], fuentes)
+    return actualizar_fact_campeon_temporada(df_pilotos, df_constructores).set_index('anio')
+
+CASOS_CAMPEON = [
+    # (anio, piloto campeón, constructor campeón; None = sin fila / NULL)
+    (2020, 20, 100),
+    (2021, None, None),      # en curso: el líder tras la ronda 2 no es campeón
+    (1950, 30, None),        # antes de 1958 no hay campeonato de constructores
+]
+
+@pytest.mark.parametrize('anio, piloto, constructor', CASOS_CAMPEON)
+def test_campeon_temporada(campeones, anio, piloto, constructor):
+    if piloto is None:
+        assert anio not in campeones.index
+        return
+
+    fila = campeones.loc[anio]
+    assert fila['piloto_id'] == piloto
+    if constructor is None:
+        assert pd.isna(fila['constructor_id'])
+    else:
+        assert fila['constructor_id'] == constructor
+
+def test_es_final_temporada_usa_calendario():
+    df = transformar_mapeo(MAPEOS['fact_campeonato_piloto'], {
+        'races.csv': RACES, 'driver_standings.csv': STANDINGS_PILOTOS,
+    })
+    finales = df[df['es_final_temporada']]
+
+    assert sorted(finales['carrera_id'].unique()) == [2, 6]
+
+# ============================================================================
+# transformar_mapeo
+# ============================================================================
+
+QUALIFYING = pd.DataFrame({
+    'raceId':        [1, 1, 1, 2],
+    'driverId':      [10, 20, 30, 10],
+    'constructorId': [100, 100, None, 100],
+    'position':      [1, 2, 3, None],
+    'q1':            ['1:30.000', '1:31.000', '1:32.000', '\\N'],
+    'q2':            ['1:29.500', '1:30.800', None, '\\N'],
+    'q3':            ['1:29.900', None, None, '\\N'],
+})
+
+def test_transformar_mapeo_clasificacion():
+    fuentes = {'races.csv': RACES, 'qualifying.csv': QUALIFYING}
+    df = transformar_mapeo(MAPEOS['fact_clasificacion'], fuentes).set_index('piloto_id')
+
+    # Fila sin constructor_id (requerida) descartada
+    assert list(df.index) == [10, 20, 10]
+    # Derivada que reutiliza derivadas anteriores: mínimo de las sesiones disputadas
+    assert df['mejor_tiempo_ms'].tolist()[:2] == [89500, 90800]
+    assert pd.isna(df['mejor_tiempo_ms'].iloc[2])
+    # Enteros leídos como float por tener nulos vuelven a Int64
+    assert str(df['posicion'].dtype) == 'Int64'
+    assert df['tiempo_id'].tolist() == [20200705, 20200705, 20201213]
+    # La fuente cacheada no se modifica
+    assert list(fuentes['qualifying.csv'].columns) == list(QUALIFYING.columns)
+
+# ============================================================================
+# actualizar_fact_pit_stop_temporada
+# ============================================================================
+
+PARADAS = pd.DataFrame({
+    'carrera_id':  [1, 1, 2, 3, 4],
+    'piloto_id':   [10, 20, 10, 10, 10],
+    'parada':      [1, 1, 1, 1, 1],
+    'duracion_ms': [22000, 24000, 26000, 21000, 23000],
+    'anio':        [2020, 2020, 2020, 2021, 2021],
+})
+
+def refrescar_paradas(monkeypatch, df_paradas, huellas_previas):
+    """Ejecutar el snapshot y devolver los años que se reescribieron"""
+    conexion = ConexionFalsa(huellas_previas.items())
+    monkeypatch.setattr(etl, 'get_connection', lambda: conexion)
+    df_resumen = actualizar_fact_pit_stop_temporada(df_paradas)
+
+    reescritos = []
+    for sql, params in conexion.sentencias:
+        if sql.startswith('REPLACE'):
+            columnas = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+            reescritos += params[columnas.index('anio')::len(columnas)]
+    return df_resumen.set_index('anio'), reescritos
+
+def test_pit_stop_temporada_resumen(monkeypatch):
+    df_resumen, reescritos = refrescar_paradas(monkeypatch, PARADAS, {})
+
+    assert reescritos == [2020, 2021]
+    assert df_resumen.loc[2020, 'cantidad_paradas'] == 3
+    assert df_resumen.loc[2020, 'mediana_ms'] == 24000
+    assert df_resumen.loc[2021, 'media_ms'] == 22000
+
+CASOS_HUELLA = [
+    # (cambio sobre PARADAS, años que deben reescribirse)
+    (lambda df: df, []),
+    (lambda df: df.assign(duracion_ms=df['duracion_ms'].where(df['anio'] != 2021, 30000)), [2021]),
+    (lambda df: df.iloc[::-1], []),                                 # el orden de llegada no importa
+    (lambda df: df[df['piloto_id'] != 20], [2020]),                 # parada eliminada
+]
+
+@pytest.mark.parametrize('cambio, esperados', CASOS_HUELLA)
+def test_pit_stop_temporada_solo_cambios(monkeypatch, cambio, esperados):
+    df_inicial, _ = refrescar_paradas(monkeypatch, PARADAS, {})
+    huellas = df_inicial['huella'].to_dict()
+
+    _, reescritos = refrescar_paradas(monkeypatch, cambio(PARADAS), huellas)
+
+    assert reescritos == esperados
+
+# ============================================================================
+# exportar_parquet
+# ============================================================================
+
+RESULTADOS = pd.DataFrame({
+    'carrera_id': [1, 2, 3, 4],
+    'piloto_id':  [10, 10, 10, 10],
+    'puntos':     [25.0, 18.0, 25.0, 10.0],
+    'tiempo_id':  [20200705, 20201213, 20210328, 20220320],
+})
+PILOTOS = pd.DataFrame({'piloto_id': [10], 'apellido': ['Hamilton']})
+
+@pytest.fixture
+def exportar(tmp_path, monkeypatch):
+    """Exportar a tmp_path y devolver las rutas (relativas) que se escribieron"""
+    pq = pytest.importorskip('pyarrow.parquet')
+    escritura_real = pq.write_table
+
+    def exportar_tablas(tablas):
+        escritas = []
+
+        def registrar(tabla, ruta, **kwargs):
+            escritas.append(os.path.relpath(ruta, tmp_path).replace(os.sep, '/'))
+            escritura_real(tabla, ruta, **kwargs)
+
+        monkeypatch.setattr(pq, 'write_table', registrar)
+        exportar_parquet(tablas, directorio=str(tmp_path))
+        return sorted(escritas)
+
+    return exportar_tablas
+
+def test_exportar_parquet_incremental(exportar, tmp_path):
+    tablas = {'fact_resultado_carrera': RESULTADOS, 'dim_piloto': PILOTOS}
+
+    assert exportar(tablas) == [
+        'dim_piloto/part-0.parquet',
+        'fact_resultado_carrera/anio=2020/part-0.parquet',
+        'fact_resultado_carrera/anio=2021/part-0.parquet',
+        'fact_resultado_carrera/anio=2022/part-0.parquet',
+    ]
+    assert exportar(tablas) == []
+
+    # Solo cambia la temporada 2021
+    corregido = RESULTADOS.assign(puntos=RESULTADOS['puntos'].where(RESULTADOS['carrera_id'] != 3, 26.0))
+    tablas['fact_resultado_carrera'] = corregido
+    assert exportar(tablas) == ['fact_resultado_carrera/anio=2021/part-0.parquet']
+
+    # Temporada eliminada: se borra su carpeta y el resto no se reescribe
+    tablas['fact_resultado_carrera'] = corregido[corregido['carrera_id'] != 4]
+    assert exportar(tablas) == []
+    assert not (tmp_path / 'fact_resultado_carrera' / 'anio=2022').exists()
+    assert (tmp_path / 'fact_resultado_carrera' / 'anio=2021' / 'part-0.parquet').exists()
+
+CASOS_ESQUEMA = [
+    # Cambios de esquema con el mismo contenido: todas las particiones se reescriben
+    lambda df: df.rename(columns={'puntos': 'puntos_carrera'}),
+    lambda df: df.astype({'puntos': 'float32'}),
+    lambda df: df.astype({'piloto_id': 'Int64'}),
+]
+
+@pytest.mark.parametrize('cambio', CASOS_ESQUEMA)
+def test_exportar_parquet_cambio_de_esquema(exportar, cambio):
+    exportar({'fact_resultado_carrera': RESULTADOS})
+
+    assert len(exportar({'fact_resultado_carrera': cambio(RESULTADOS)})) == 3